@@ -0,0 +1,376 @@
+"""
+TekNet Global Automation System - Benchmarks
+Seeds a database with N videos and their stats history, then measures the API routes (Flask test
+client and a concurrent HTTP load generator) and the video pipeline against fake backends.
+
+    python benchmark.py --rows 100000
+    python benchmark.py --rows 1000000 --save-baseline
+    python benchmark.py --rows 1000000 --baseline benchmark_baseline.json --tolerance 0.25
+
+Exits with status 1 when a result regresses past the tolerance against the baseline.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import tempfile
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+PLATFORMS = ('youtube', 'instagram', 'tiktok')
+AI_SERVICES = ('InVideo AI - Professional', 'Galaxy.ai - Viral Content', 'AutoShorts.ai - Short Form',
+               'Pollo.ai - Creative', 'Synthesia - AI Avatars')
+STATUSES = ('Video Uploaded', 'Generated')
+DURATIONS = ('30 seconds', '60 seconds', '90 seconds', '2 minutes')
+SEED_CHUNK = 50000
+SNAPSHOTS_PER_VIDEO = 3  # stats refreshes seeded per video, spread between its upload and now
+
+# (name, path) pairs measured through the test client and the HTTP load generator
+ROUTES = (
+    ('status', '/api/status'),
+    ('videos', '/api/videos?limit=10'),
+    ('videos_filtered', '/api/videos?limit=50&platform=youtube&status=Video%20Uploaded'),
+    ('videos_fields', '/api/videos?limit=200&fields=id,title,views,created_date'),
+    ('dashboard', '/api/dashboard'),
+    ('analytics', '/api/analytics?group_by=platform'),
+    ('accounts', '/api/accounts'),
+    ('metrics', '/metrics')
+)
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+def summarize(latencies, elapsed, errors=0):
+    """Latency percentiles in milliseconds and throughput per second"""
+    return {
+        'count': len(latencies),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else None,
+        'throughput_per_s': round(len(latencies) / elapsed, 2) if elapsed else None
+    }
+
+def seed_history(videos, now, rng, granularities, rollups):
+    """Build stats snapshots for seeded videos and add their gains to the rollup totals, as StatsHistory would.
+    videos holds (id, platform, ai_service, views, likes, comments, revenue, created) tuples."""
+    snapshots = []
+    for video_id, platform, ai_service, views, likes, comments, revenue, created in videos:
+        span = max(1, int((now - created).total_seconds()))
+        captures = sorted(created + timedelta(seconds=rng.randint(0, span)) for _ in range(SNAPSHOTS_PER_VIDEO))
+        previous = (0, 0, 0, 0.0)
+        for index, captured in enumerate(captures):
+            share = (index + 1) / len(captures)
+            current = (int(views * share), int(likes * share), int(comments * share), revenue * share)
+            snapshots.append((video_id, platform, ai_service, *current, captured.strftime('%Y-%m-%d %H:%M:%S')))
+            for table, bucket_format in granularities:
+                key = (table, captured.strftime(bucket_format), platform, ai_service)
+                videos_total, *totals = rollups.get(key, (0, 0, 0, 0, 0.0))
+                rollups[key] = (videos_total + (index == 0),
+                                *(total + value - before for total, value, before in zip(totals, current, previous)))
+            previous = current
+    return snapshots
+
+def seed_database(app_module, rows, days=365, seed=42):
+    """Fill the videos table up to the requested number of rows with a realistic spread of values,
+    plus SNAPSHOTS_PER_VIDEO stats snapshots per video and the hourly and daily rollups they add up to"""
+    db = app_module.db
+    existing = db.fetchone('SELECT COUNT(*) FROM videos')[0]
+    if existing >= rows:
+        print(f"📦 Database already has {existing:,} videos, skipping seed")
+        return 0
+    
+    rng = random.Random(seed + existing)
+    now = datetime.utcnow()
+    remaining = rows - existing
+    granularities = list(app_module.ANALYTICS_GRANULARITIES.values())
+    rollups = {}
+    started = time.perf_counter()
+    
+    with db.transaction() as cursor:
+        for platform in PLATFORMS:
+            cursor.execute('''
+                INSERT INTO accounts (platform, username, oauth_connected, url)
+                SELECT ?, 'teknetglobal', 1, ? WHERE NOT EXISTS (SELECT 1 FROM accounts WHERE platform = ?)
+            ''', (platform, f'https://example.com/{platform}', platform))
+    
+    conn = db.connection()
+    conn.execute('PRAGMA synchronous = OFF')
+    try:
+        while remaining:
+            batch = []
+            for _ in range(min(SEED_CHUNK, remaining)):
+                created = now - timedelta(seconds=rng.randint(0, days * 86400))
+                views = int(rng.paretovariate(1.5) * 100)
+                platform = rng.choice(PLATFORMS)
+                video_id = f"SEED_{rng.getrandbits(48):012x}"
+                batch.append((
+                    f"Benchmark video {video_id}", platform, rng.choice(AI_SERVICES), rng.choice(DURATIONS),
+                    views, views // 20, views // 100, views * 0.003, f"https://example.com/{platform}/{video_id}",
+                    video_id, rng.choice(STATUSES), created.strftime('%Y-%m-%d %H:%M:%S'),
+                    (now + timedelta(days=3650)).strftime('%Y-%m-%d %H:%M:%S')
+                ))
+            with db.transaction() as cursor:
+                cursor.executemany('''
+                    INSERT INTO videos (title, platform, ai_service, duration, views, likes, comments, revenue,
+                                        video_url, youtube_video_id, status, created_date, stats_next_refresh)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', batch)
+                # Nothing else writes during the seed, so the chunk holds the highest IDs
+                cursor.execute('SELECT id FROM videos ORDER BY id DESC LIMIT ?', (len(batch),))
+                ids = [row[0] for row in reversed(cursor.fetchall())]
+                videos = [(video_id, row[1], row[2], *row[4:8], datetime.strptime(row[11], '%Y-%m-%d %H:%M:%S'))
+                          for video_id, row in zip(ids, batch)]
+                cursor.executemany('''
+                    INSERT INTO video_stats_snapshots (video_id, platform, ai_service, views, likes, comments,
+                                                       revenue, captured_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', seed_history(videos, now, rng, granularities, rollups))
+            remaining -= len(batch)
+            print(f"📦 Seeded {rows - remaining:,}/{rows:,} videos")
+        
+        with db.transaction() as cursor:
+            for table, _ in granularities:
+                cursor.executemany(f'''
+                    INSERT INTO {table} (bucket, platform, ai_service, videos, views, likes, comments, revenue)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (bucket, platform, ai_service) DO UPDATE SET
+                        videos = videos + excluded.videos,
+                        views = views + excluded.views,
+                        likes = likes + excluded.likes,
+                        comments = comments + excluded.comments,
+                        revenue = revenue + excluded.revenue
+                ''', [(*key[1:], *totals) for key, totals in rollups.items() if key[0] == table])
+        print(f"📦 Seeded {(rows - existing) * SNAPSHOTS_PER_VIDEO:,} stats snapshots and "
+              f"{len(rollups):,} rollup rows")
+    finally:
+        conn.execute('PRAGMA synchronous = NORMAL')
+    
+    conn.execute('ANALYZE')
+    print(f"📦 Seeding took {time.perf_counter() - started:.1f}s")
+    return rows - existing
+
+def stay_out_of_election(app_module):
+    """Keep this process from leading automation while routes are driven, so no pool, recovery sweep,
+    stats refresh or retention pass competes with the measured requests"""
+    with app_module.db.transaction() as cursor:
+        cursor.execute("UPDATE automation_control SET desired_state = 'STOPPED' WHERE id = 1")
+    # Requests only join the election while the coordinator has no thread; give it one that has already ended
+    placeholder = threading.Thread(name='benchmark-no-election')
+    placeholder.start()
+    placeholder.join()
+    app_module.automation_coordinator.thread = placeholder
+
+def bench_test_client(app_module, requests_per_route, warmup=5):
+    """Time each route in-process through the Flask test client"""
+    client = app_module.app.test_client()
+    results = {}
+    for name, path in ROUTES:
+        for _ in range(warmup):
+            client.get(path)
+        latencies = []
+        errors = 0
+        started = time.perf_counter()
+        for _ in range(requests_per_route):
+            request_started = time.perf_counter()
+            response = client.get(path)
+            latencies.append(time.perf_counter() - request_started)
+            errors += response.status_code >= 400
+        results[f'client.{name}'] = summarize(latencies, time.perf_counter() - started, errors)
+    
+    # Conditional dashboard request answered with 304
+    etag = client.get('/api/dashboard').headers.get('ETag')
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests_per_route):
+        request_started = time.perf_counter()
+        client.get('/api/dashboard', headers={'If-None-Match': etag})
+        latencies.append(time.perf_counter() - request_started)
+    results['client.dashboard_304'] = summarize(latencies, time.perf_counter() - started)
+    return results
+
+def bench_http_load(app_module, concurrency, duration):
+    """Drive the route mix over real HTTP from concurrent keep-alive clients for a fixed time"""
+    from werkzeug.serving import make_server
+    
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)  # no access log line per request
+    server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='benchmark-server', daemon=True).start()
+    port = server.server_port
+    
+    deadline = time.perf_counter() + duration
+    
+    def client_loop(worker):
+        rng = random.Random(worker)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        latencies, errors = {}, {}
+        while time.perf_counter() < deadline:
+            name, path = rng.choice(ROUTES)
+            request_started = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                failed = response.status >= 400
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                failed = True
+            latencies.setdefault(name, []).append(time.perf_counter() - request_started)
+            errors[name] = errors.get(name, 0) + failed
+        conn.close()
+        return latencies, errors
+    
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(client_loop, range(concurrency)))
+    finally:
+        server.shutdown()
+    elapsed = time.perf_counter() - started
+    
+    results = {}
+    everything, total_errors = [], 0
+    for name, _ in ROUTES:
+        latencies = [sample for worker_latencies, _ in outcomes for sample in worker_latencies.get(name, [])]
+        errors = sum(worker_errors.get(name, 0) for _, worker_errors in outcomes)
+        results[f'http.{name}'] = summarize(latencies, elapsed, errors)
+        everything.extend(latencies)
+        total_errors += errors
+    results['http.all'] = summarize(everything, elapsed, total_errors)
+    return results
+
+def bench_pipeline(app_module, videos, concurrency, fake_latency):
+    """Run create_and_upload_video end to end against the simulated AI providers and platforms"""
+    for backend in app_module.simulated_backends.values():
+        backend.latency = (fake_latency, 0.0)
+    for provider in app_module.ai_provider_client.providers.values():
+        provider.median_latency = fake_latency
+        provider.error_rate = 0.0
+    
+    # Quotas and rate limits would otherwise defer most of the run
+    quota = app_module.quota_manager
+    quota.quotas = {platform: 10 ** 12 for platform in quota.quotas}
+    quota.rate_limits = {platform: (10.0 ** 6, 10 ** 6) for platform in quota.rate_limits}
+    quota._buckets = {}
+    
+    engine = app_module.automation_engine
+    services = list(engine.video_generator.ai_services)
+    
+    def run_one(index):
+        started = time.perf_counter()
+        ok = engine.create_and_upload_video(f"Benchmark pipeline video {index} {time.time_ns()}",
+                                            services[index % len(services)], '30 seconds')
+        return time.perf_counter() - started, ok
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(run_one, range(videos)))
+    elapsed = time.perf_counter() - started
+    
+    return {'pipeline.create_and_upload_video': summarize([latency for latency, _ in outcomes], elapsed,
+                                                          sum(not ok for _, ok in outcomes))}
+
+def compare(results, baseline, tolerance):
+    """List regressions: p95 slower or throughput lower than the baseline by more than the tolerance"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current['p95_ms'] and previous.get('p95_ms') and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if (current['throughput_per_s'] and previous.get('throughput_per_s')
+                and current['throughput_per_s'] < previous['throughput_per_s'] * (1 - tolerance)):
+            regressions.append(f"{name}: throughput {previous['throughput_per_s']}/s -> {current['throughput_per_s']}/s")
+    return regressions
+
+def print_report(results):
+    print(f"\n{'benchmark':<44}{'count':>8}{'err':>6}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'per s':>11}")
+    for name, result in results.items():
+        print(f"{name:<44}{result['count']:>8}{result['errors']:>6}{result['p50_ms'] or 0:>11.3f}"
+              f"{result['p95_ms'] or 0:>11.3f}{result['p99_ms'] or 0:>11.3f}{result['throughput_per_s'] or 0:>11.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the TekNet API routes and video pipeline')
+    parser.add_argument('--db', default='benchmark.db', help='SQLite database to seed and query')
+    parser.add_argument('--rows', type=int, default=10000, help='videos to seed (10k to 10M)')
+    parser.add_argument('--requests', type=int, default=200, help='test-client requests per route')
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent HTTP clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of HTTP load')
+    parser.add_argument('--pipeline-videos', type=int, default=50, help='pipeline runs to time')
+    parser.add_argument('--pipeline-concurrency', type=int, default=4)
+    parser.add_argument('--fake-latency', type=float, default=0.0, help='seconds per fake render and upload')
+    parser.add_argument('--skip', action='append', default=[], choices=('client', 'http', 'pipeline'))
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', default='benchmark_baseline.json', help='baseline results to compare with')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed fractional slowdown')
+    args = parser.parse_args(argv)
+    
+    # The app reads its configuration at import time
+    scratch = tempfile.mkdtemp(prefix='teknet-bench-')
+    os.environ['DATABASE_PATH'] = args.db
+    os.environ.setdefault('ARTIFACT_ROOT', os.path.join(scratch, 'generated_videos'))
+    os.environ.setdefault('VIDEO_CACHE_DIR', os.path.join(scratch, 'video_cache'))
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    import working_test_system as app_module
+    
+    app_module.init_database()
+    seed_database(app_module, args.rows)
+    stay_out_of_election(app_module)
+    
+    results = {}
+    if 'client' not in args.skip:
+        results.update(bench_test_client(app_module, args.requests))
+    if 'http' not in args.skip:
+        results.update(bench_http_load(app_module, args.concurrency, args.duration))
+    if 'pipeline' not in args.skip:
+        results.update(bench_pipeline(app_module, args.pipeline_videos, args.pipeline_concurrency,
+                                      args.fake_latency))
+    
+    print_report(results)
+    
+    report = {'rows': args.rows, 'recorded': datetime.utcnow().isoformat(timespec='seconds'), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️ No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('rows') != args.rows:
+        print(f"\n⚠️ Baseline was recorded with {baseline.get('rows'):,} rows, this run used {args.rows:,}")
+    
+    regressions = compare(results, baseline['results'], args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+    
+    print(f"\n✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
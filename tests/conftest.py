@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# The app reads its configuration at import time, so point it at a scratch directory first
+_scratch = tempfile.mkdtemp(prefix='teknet_tests_')
+os.environ.setdefault('DATABASE_PATH', os.path.join(_scratch, 'automation.db'))
+os.environ.setdefault('ARTIFACT_ROOT', os.path.join(_scratch, 'generated_videos'))
+os.environ.setdefault('VIDEO_CACHE_DIR', os.path.join(_scratch, 'video_cache'))
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
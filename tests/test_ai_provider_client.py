@@ -0,0 +1,90 @@
+import time
+
+import pytest
+
+import working_test_system as app
+
+
+class FakeProvider:
+    """Provider with a fixed render time that can be told to fail"""
+    
+    def __init__(self, name, latency=0.0, fail=False):
+        self.name = name
+        self.latency = latency
+        self.fail = fail
+    
+    def render(self, title, duration_seconds):
+        time.sleep(self.latency)
+        if self.fail:
+            raise app.ProviderError(f"{self.name} render failed")
+        return f"{self.name}: {title}"
+
+
+def make_client(primary, fallback, **kwargs):
+    return app.AIProviderClient({'primary': primary, 'fallback': fallback},
+                                fallbacks={'primary': 'fallback'}, **kwargs)
+
+
+def test_breaker_opens_then_lets_one_trial_through_when_half_open():
+    breaker = app.CircuitBreaker(failure_threshold=3, reset_seconds=0.05)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+    
+    time.sleep(0.06)
+    assert breaker.state == 'half_open'
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+    
+    # A failed trial reopens the circuit straight away
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.allow() and breaker.allow()
+
+
+def test_open_circuit_sends_renders_straight_to_the_fallback():
+    client = make_client(FakeProvider('primary', fail=True), FakeProvider('fallback'), hedge=False)
+    client.breakers['primary'] = app.CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    
+    for _ in range(2):
+        assert client.render('primary', 'Title', 30) == ('fallback: Title', 'fallback')
+    assert client.breakers['primary'].state == 'open'
+    
+    assert client.render('primary', 'Title', 30) == ('fallback: Title', 'fallback')
+    assert client.calls['primary']['requests'] == 2
+
+
+def test_slow_render_is_hedged_with_the_fallback():
+    client = make_client(FakeProvider('primary', latency=1.0), FakeProvider('fallback', latency=0.01))
+    for _ in range(app.AI_HEDGE_MIN_SAMPLES):
+        client.latency['primary'].record(0.05)
+    
+    started = time.monotonic()
+    content, provider = client.render('primary', 'Title', 30)
+    
+    assert (content, provider) == ('fallback: Title', 'fallback')
+    assert time.monotonic() - started < 0.5
+    assert client.calls['fallback']['hedges'] == 1
+
+
+def test_no_hedge_before_enough_latency_samples():
+    client = make_client(FakeProvider('primary', latency=0.2), FakeProvider('fallback'))
+    
+    assert client.render('primary', 'Title', 30) == ('primary: Title', 'primary')
+    assert client.calls['fallback']['requests'] == 0
+
+
+def test_render_times_out_and_counts_against_the_breakers():
+    client = make_client(FakeProvider('primary', latency=0.5), FakeProvider('fallback', latency=0.5),
+                         timeout=0.1, hedge=False)
+    
+    with pytest.raises(app.ProviderTimeout):
+        client.render('primary', 'Title', 30)
+    assert client.breakers['primary'].failures == 1
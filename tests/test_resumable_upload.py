@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+import working_test_system as app
+
+CHUNK_SIZE = 256 * 1024
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(os.urandom(5 * 1024 * 1024))
+    return str(path)
+
+
+@pytest.fixture
+def server(tmp_path):
+    received = tmp_path / 'received'
+    received.mkdir()
+    stand_in = app.LocalResumableUploadServer(storage_dir=str(received)).start()
+    yield stand_in
+    stand_in.stop()
+
+
+def received_bytes(server):
+    (session,) = server.sessions.values()
+    with open(session['path'], 'rb') as f:
+        return f.read()
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_upload_resumes_after_dropped_connections(server, video_file):
+    server.drop_every = 3
+    client = app.ResumableUploadClient(server.url, chunk_size=CHUNK_SIZE, resume_delay=0)
+    
+    result = client.upload(video_file)
+    
+    assert result['size'] == os.path.getsize(video_file)
+    assert received_bytes(server) == read(video_file)
+    # Every third chunk was cut off half way, so more chunks were sent than the file needs
+    assert server.chunks_received > os.path.getsize(video_file) // CHUNK_SIZE
+
+
+def test_upload_continues_a_saved_session(server, video_file):
+    progress = []
+    
+    class Interrupted(Exception):
+        pass
+    
+    def stop_after_two_chunks(session_url, offset, total_size):
+        progress.append((session_url, offset))
+        if len(progress) == 2:
+            raise Interrupted()
+    
+    with pytest.raises(Interrupted):
+        app.ResumableUploadClient(server.url, chunk_size=CHUNK_SIZE).upload(video_file, on_progress=stop_after_two_chunks)
+    session_url, offset = progress[-1]
+    assert offset == 2 * CHUNK_SIZE
+    
+    # A new client, as after a restart, picks the session up from the server's confirmed offset
+    chunks_before = server.chunks_received
+    result = app.ResumableUploadClient(server.url, chunk_size=CHUNK_SIZE).upload(video_file, session_url=session_url)
+    
+    assert result['size'] == os.path.getsize(video_file)
+    assert received_bytes(server) == read(video_file)
+    assert server.chunks_received - chunks_before == os.path.getsize(video_file) // CHUNK_SIZE - 2
+
+
+def test_upload_gives_up_after_max_resumes(server, video_file):
+    server.drop_every = 1
+    client = app.ResumableUploadClient(server.url, chunk_size=CHUNK_SIZE, max_resumes=2, resume_delay=0)
+    
+    with pytest.raises(app.UploadError):
+        client.upload(video_file)